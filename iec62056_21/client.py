@@ -1,43 +1,61 @@
 import time
 import logging
+import string
+from functools import lru_cache
 
-from iec62056_21 import messages, constants, transports, exceptions
+from iec62056_21 import messages, constants, exceptions
 
 logger = logging.getLogger(__name__)
 
+_ACK = constants.ACK.encode(constants.ENCODING)
+_NACK = constants.NACK.encode(constants.ENCODING)
+
+# Responses that are not answer data, keyed on their first byte.
+_RESPONSE_PARSERS = {
+    # We probably received a password challenge
+    constants.SOH.encode(constants.ENCODING): messages.CommandMessage.from_bytes
+}
+
+_LOWERCASE_LETTERS = frozenset(string.ascii_lowercase)
+
+_BAUDRATES_MODE_C = {
+    "0": 300,
+    "1": 600,
+    "2": 1200,
+    "3": 2400,
+    "4": 4800,
+    "5": 9600,
+    "6": 19200,
+}
+
+_MODE_CONTROL_CHARACTER = {
+    "readout": "0",
+    "programming": "1",
+    "binary": "2",
+    "manufacturer6": "6",
+    "manufacturer7": "7",
+    "manufacturer8": "8",
+    "manufacturer9": "9",
+}
+
+
+@lru_cache(maxsize=128)
+def _build_message(factory, *args):
+    """
+    Returns the message made by factory(*args) together with its bytes. Cached so
+    polling the same devices and values again doesn't rebuild the same messages.
+    """
+    message = factory(*args)
+    return message, message.to_bytes()
+
 
 class Iec6205621Client:
     """
     A client class for IEC 62056-21. Only validated with meters using mode C.
     """
 
-    BAUDRATES_MODE_C = {
-        "0": 300,
-        "1": 600,
-        "2": 1200,
-        "3": 2400,
-        "4": 4800,
-        "5": 9600,
-        "6": 19200,
-    }
-    ALLOWED_MODES = [
-        "readout",
-        "programming",
-        "binary",
-        "manufacturer6",
-        "manufacturer7",
-        "manufacturer8",
-        "manufacturer9",
-    ]
-    MODE_CONTROL_CHARACTER = {
-        "readout": "0",
-        "programming": "1",
-        "binary": "2",
-        "manufacturer6": "6",
-        "manufacturer7": "7",
-        "manufacturer8": "8",
-        "manufacturer9": "9",
-    }
+    BAUDRATES_MODE_C = _BAUDRATES_MODE_C
+    MODE_CONTROL_CHARACTER = _MODE_CONTROL_CHARACTER
     SHORT_REACTION_TIME = 0.02
     REACTION_TIME = 0.2
 
@@ -56,8 +74,14 @@ class Iec6205621Client:
         self.battery_powered = battery_powered
         self.identification = None
         self._switchover_baudrate_char = None
+        # The baud rate for the switchover. Set on startup.
+        self.switchover_baudrate = None
         self.manufacturer_id = None
         self.use_short_reaction_time = False
+        # The reaction time of the device. Set on startup.
+        self.reaction_time = self.REACTION_TIME
+        self._rest_duration = self.REACTION_TIME * 1.25
+        self._next_send_time = 0.0
         self.error_parser = error_parser_class()
         self._current_baudrate: int = 300
 
@@ -68,11 +92,12 @@ class Iec6205621Client:
             )
 
     @property
-    def switchover_baudrate(self):
+    def ALLOWED_MODES(self):
         """
-        Shortcut to get the baud rate for the switchover.
+        The modes that can be selected, derived from MODE_CONTROL_CHARACTER so
+        subclasses only need to override that.
         """
-        return self.BAUDRATES_MODE_C.get(self._switchover_baudrate_char)
+        return frozenset(self.MODE_CONTROL_CHARACTER)
 
     def read_single_value(self, address, additional_data="1"):
         """
@@ -88,9 +113,11 @@ class Iec6205621Client:
         # TODO: When not using the additional data on an EMH meter we get an ack back.
         #   a bit later we get the break message. Is the device waiting?
 
-        request = messages.CommandMessage.for_single_read(address, additional_data)
+        request, request_bytes = _build_message(
+            messages.CommandMessage.for_single_read, address, additional_data
+        )
         logger.info(f"Sending read request: {request}")
-        self.transport.send(request.to_bytes())
+        self._send(request_bytes)
 
         response = self.read_response()
 
@@ -114,15 +141,20 @@ class Iec6205621Client:
         :return:
         """
 
-        request = messages.CommandMessage.for_single_write(address, data)
+        # The cache treats equal values as the same key, so 1, 1.0 and True would
+        # all be sent as the first one. The data set formats the value with str()
+        # anyway, so the cache is keyed on that.
+        request, request_bytes = _build_message(
+            messages.CommandMessage.for_single_write, address, str(data)
+        )
         logger.info(f"Sending write request: {request}")
-        self.transport.send(request.to_bytes())
+        self._send(request_bytes)
 
         ack = self._recv_ack()
-        if ack == constants.ACK:
+        if ack == _ACK:
             logger.info(f"Write request accepted")
             return
-        elif ack == constants.NACK:
+        elif ack == _NACK:
             # TODO: implement retry and raise proper error.
             raise ValueError(f"Received NACK upon sending {request}")
         else:
@@ -157,13 +189,20 @@ class Iec6205621Client:
 
         # Setting the baudrate to the one propsed by the device.
         self._switchover_baudrate_char = ident_msg.switchover_baudrate_char
+        self.switchover_baudrate = self.BAUDRATES_MODE_C.get(
+            self._switchover_baudrate_char
+        )
         self.identification = ident_msg.identification
         self.manufacturer_id = ident_msg.manufacturer
 
         # If a meter transmits the third letter (last) in lower case, the minimum
         # reaction time for the device is 20 ms instead of 200 ms.
-        if self.manufacturer_id[-1].islower():
-            self.use_short_reaction_time = True
+        self.use_short_reaction_time = self.manufacturer_id[-1] in _LOWERCASE_LETTERS
+        if self.use_short_reaction_time:
+            self.reaction_time = self.SHORT_REACTION_TIME
+        else:
+            self.reaction_time = self.REACTION_TIME
+        self._rest_duration = self.reaction_time * 1.25
 
     def access_programming_mode(self):
         """
@@ -200,7 +239,7 @@ class Iec6205621Client:
         data_set = messages.DataSet(value=_pw)
         cmd = messages.CommandMessage(command="P", command_type="1", data_set=data_set)
         logger.info("Sending password to meter")
-        self.transport.send(cmd.to_bytes())
+        self._send(cmd.to_bytes())
 
     def send_break(self):
         """
@@ -211,7 +250,7 @@ class Iec6205621Client:
         break_msg = messages.CommandMessage(
             command="B", command_type="0", data_set=None
         )
-        self.transport.send(break_msg.to_bytes())
+        self._send(break_msg.to_bytes())
 
     def ack_with_option_select(self, mode):
         """
@@ -225,17 +264,22 @@ class Iec6205621Client:
         # TODO: allow the client to suggest a new baudrate to the devices instead of
         #  the devices proposed one.
 
+        # Check before sending anything so we don't leave the device mid handshake.
+        if mode not in self.ALLOWED_MODES:
+            raise ValueError(
+                f"{mode!r} is not a valid mode. "
+                f"Use one of {', '.join(self.MODE_CONTROL_CHARACTER)}"
+            )
         mode_char = self.MODE_CONTROL_CHARACTER[mode]
 
-        ack_message = messages.AckOptionSelectMessage(
-            mode_char=mode_char, baud_char=self._switchover_baudrate_char
+        ack_message, ack_bytes = _build_message(
+            messages.AckOptionSelectMessage, self._switchover_baudrate_char, mode_char
         )
         logger.info(f"Sending AckOptionsSelect message: {ack_message}")
-        self.transport.send(ack_message.to_bytes())
+        self._send(ack_bytes)
+        # Let the ack leave the port before it is reopened with the new baudrate.
         self.rest()
-        self.transport.switch_baudrate(
-            baud=self.BAUDRATES_MODE_C[self._switchover_baudrate_char]
-        )
+        self.transport.switch_baudrate(baud=self.switchover_baudrate)
 
     def send_init_request(self):
         """
@@ -246,10 +290,12 @@ class Iec6205621Client:
          you want to talk to by adding the address in the request.
 
         """
-        request = messages.RequestMessage(device_address=self.device_address)
+        request, request_bytes = _build_message(
+            messages.RequestMessage, self.device_address
+        )
         logger.info(f"Sending request message: {request}")
-        self.transport.send(request.to_bytes())
-        self.rest()
+        self._send(request_bytes)
+        self._schedule_rest()
 
     def read_identification(self):
         """
@@ -279,25 +325,32 @@ class Iec6205621Client:
         if fast:
             raise NotImplemented("Fast startup sequence is not yet implemented")
 
-        timeout = 2.2
-        duration = 0
-        start_time = time.time()
+        duration = 2.2
+        # Each char is 10 bits on the line (start bit, 7 data bits, parity, stop bit)
+        # so the UART will pace the null chars to cover the whole duration.
+        null_chars = b"\x00" * int(duration * self._transport_baudrate() / 10)
+        start_time = time.monotonic()
         logger.info("Sending battery startup sequence")
-        while duration < timeout:
-            out = b"\x00"
-            self.transport.send(out)
-            self.rest(0.2)
-            duration = time.time() - start_time
+        self._send(null_chars)
+        # Transports not paced by a UART (TCP) return before the duration has passed.
+        remaining = max(duration - (time.monotonic() - start_time), 0.0)
         logger.info("Startup Sequence finished")
 
-        self.rest(1.5)
+        self._schedule_rest(remaining + 1.6)
+
+    def _transport_baudrate(self):
+        """
+        The baudrate of the serial port of the transport. Transports without one
+        (TCP) are assumed to run at the baudrate the protocol starts with.
+        """
+        port = getattr(self.transport, "port", None)
+        return getattr(port, "baudrate", self._current_baudrate)
 
     def _recv_ack(self):
         """
-        Simple way of receiving an ack or nack.
+        Simple way of receiving an ack or nack. Returns the raw byte.
         """
-        ack = self.transport.recv(1).decode(constants.ENCODING)
-        return ack
+        return self.transport.recv(1)
 
     def read_response(self, timeout=None):
         """
@@ -306,35 +359,45 @@ class Iec6205621Client:
         :param timeout:
         """
         data = self.transport.read()
-        if data.startswith(b"\x01"):
-            # We probably received a password challenge
-            return messages.CommandMessage.from_bytes(data)
-        else:
-            response = messages.AnswerDataMessage.from_bytes(data)
-            self.error_parser.check_for_errors(response)
-            return response
+        parser = _RESPONSE_PARSERS.get(data[:1])
+        if parser is not None:
+            return parser(data)
 
-    @property
-    def reaction_time(self):
-        """
-        The device can define two different reaction times. Depending if the third
-        letter in the manufacturer ID in the identification request is in lower case the
-        shorter reaction time is used.
-        """
-        if self.use_short_reaction_time:
-            return self.SHORT_REACTION_TIME
-        else:
-            return self.REACTION_TIME
+        response = messages.AnswerDataMessage.from_bytes(data)
+        self.error_parser.check_for_errors(response)
+        return response
 
     def rest(self, duration=None):
         """
         The protocol needs some timeouts between reads and writes to enable the device
         to properly parse a message and return the result.
         """
+        self._schedule_rest(duration)
+        self._wait_for_rest()
 
-        _duration = duration or (self.reaction_time * 1.25)
+    def _schedule_rest(self, duration=None):
+        """
+        Like rest() but doesn't block, it delays the next send until the duration has
+        passed. Time spent waiting on a read counts towards the rest.
+        """
+        _duration = duration or self._rest_duration
         logger.debug(f"Resting for {_duration} seconds")
-        time.sleep(_duration)
+        self._next_send_time = time.monotonic() + _duration
+
+    def _wait_for_rest(self):
+        """
+        Sleeps for what is left of the current rest.
+        """
+        delay = self._next_send_time - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _send(self, data):
+        """
+        Sends data over the transport when the current rest is over.
+        """
+        self._wait_for_rest()
+        self.transport.send(data)
 
     @classmethod
     def with_serial_transport(
@@ -354,9 +417,17 @@ class Iec6205621Client:
         :param battery_powered:
         :return:
         """
+        # Transports are imported here so importing the client doesn't load pyserial
+        # and socket when a transport is passed in directly.
+        from iec62056_21 import transports
+
         transport = transports.SerialTransport(port=port)
         return cls(
-            transport, device_address, password, battery_powered, error_parser_class
+            transport,
+            device_address,
+            password,
+            battery_powered,
+            error_parser_class,
         )
 
     @classmethod
@@ -377,7 +448,13 @@ class Iec6205621Client:
         :param battery_powered:
         :return:
         """
+        from iec62056_21 import transports
+
         transport = transports.TcpTransport(address=address)
         return cls(
-            transport, device_address, password, battery_powered, error_parser_class
+            transport,
+            device_address,
+            password,
+            battery_powered,
+            error_parser_class,
         )
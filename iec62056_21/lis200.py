@@ -5,6 +5,9 @@ import attr
 from iec62056_21.messages import Iec6205621Data
 from iec62056_21 import constants, utils, exceptions
 
+# Regex to find error codes in values. Compiled once for reuse later.
+_ERROR_RE = re.compile(r"#(\d{4})")
+
 
 def datetime_is_aware(d):
     return d.tzinfo is not None and d.tzinfo.utcoffset(d) is not None
@@ -13,16 +16,47 @@ def datetime_is_aware(d):
 def format_datetime(dt):
     if datetime_is_aware(dt):
         raise ValueError("Lis200 does not handle timezone aware datetime objects.")
-    return dt.strftime("%Y-%m-%d,%H:%M:%S")
+    return (
+        f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d},"
+        f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
+    )
+
+
+# Timezones keyed on utc offset in seconds. Archives use the same offset for all rows.
+_TZ_CACHE = {}
 
 
 def parse_datetime(datetime_string, utc_offset=None):
-    date = datetime.strptime(datetime_string, "%Y-%m-%d,%H:%M:%S")
+    # The format is fixed, YYYY-MM-DD,hh:mm:ss, so slicing is a lot faster than
+    # strptime. Called for every row in archive readouts.
+    s = datetime_string
+    if (
+        len(s) != 19
+        or s[4] != "-"
+        or s[7] != "-"
+        or s[10] != ","
+        or s[13] != ":"
+        or s[16] != ":"
+        or not (s[0:4] + s[5:7] + s[8:10] + s[11:13] + s[14:16] + s[17:19]).isdigit()
+    ):
+        raise ValueError(f"{datetime_string!r} is not a valid LIS200 datetime")
 
+    offset_tz = None
     if utc_offset:
-        offset_tz = timezone(timedelta(seconds=utc_offset))
-        date = date.replace(tzinfo=offset_tz)
-    return date
+        offset_tz = _TZ_CACHE.get(utc_offset)
+        if offset_tz is None:
+            offset_tz = timezone(timedelta(seconds=utc_offset))
+            _TZ_CACHE[utc_offset] = offset_tz
+
+    return datetime(
+        int(s[0:4]),
+        int(s[5:7]),
+        int(s[8:10]),
+        int(s[11:13]),
+        int(s[14:16]),
+        int(s[17:19]),
+        tzinfo=offset_tz,
+    )
 
 
 class ArchiveReadoutCommand(Iec6205621Data):
@@ -113,7 +147,7 @@ class ArchiveReadoutCommand(Iec6205621Data):
         )
 
 
-@attr.s
+@attr.s(slots=True, frozen=True)
 class ArchiveDataPoint:
 
     timestamp = attr.ib()
@@ -142,41 +176,85 @@ class ArchiveReadout:
         self.datetime_position = datetime_position
         self.utc_offset = utc_offset
 
+    def _columns(self):
+        """
+        Returns (address, unit) for each column in the archive.
+        """
+        # Strip of all left leading zeros of the addresses since we don't need them.
+        return [
+            (address.value.lstrip("0"), unit.value or None)
+            for address, unit in zip(
+                self.addresses.data_block.data_lines[0].data_sets,
+                self.units.data_block.data_lines[0].data_sets,
+            )
+        ]
+
+    @staticmethod
+    def _check_line_length(line, columns):
+        if len(line.data_sets) > len(columns):
+            raise exceptions.Iec6205621ParseError(
+                f"Archive line has {len(line.data_sets)} values but there are "
+                f"only {len(columns)} addresses and units"
+            )
+
     @property
     def data(self):
-        data_points = list()
-        _addresses = self.addresses.data_block.data_lines[0].data_sets
-        _units = self.units.data_block.data_lines[0].data_sets
+        return list(self.iter_data())
+
+    def iter_data(self):
+        """
+        Yields an ArchiveDataPoint per value in the archive. Use instead of data when
+        streaming large archives so all points are not held in memory at once.
+        """
+        columns = self._columns()
+        # other positions are refered without initial 0. But that wont work when
+        # referenceing a list.
+        datetime_index = self.datetime_position - 1
+        utc_offset = self.utc_offset
 
         for line in self.values.data_block.data_lines:
-
-            # other positions are refered without initial 0. But that wont work when
-            # referenceing a list.
-            datetime_index = self.datetime_position - 1
-
-            timestamp = parse_datetime(
-                datetime_string=line.data_sets[datetime_index].value,
-                utc_offset=self.utc_offset,
-            )
-
-            for i, data_set in enumerate(line.data_sets):
-
-                # Strip of all left leading zeros since we don't need them.
-                _address = _addresses[i].value.lstrip("0")
-                if _units[i].value:
-                    _unit = _units[i].value
-                else:
-                    _unit = None
-                _value = data_set.value
-                _timestamp = timestamp
-
-                data_point = ArchiveDataPoint(
-                    timestamp=_timestamp, value=_value, address=_address, unit=_unit
+            timestamp = parse_datetime(line.data_sets[datetime_index].value, utc_offset)
+            self._check_line_length(line, columns)
+            for (address, unit), data_set in zip(columns, line.data_sets):
+                yield ArchiveDataPoint(
+                    timestamp=timestamp,
+                    value=data_set.value,
+                    address=address,
+                    unit=unit,
                 )
 
-                data_points.append(data_point)
-
-        return data_points
+    def columnar(self):
+        """
+        Returns the archive data as a dict of equally sized lists, one entry per data
+        point: `timestamps`, `values`, `addresses` and `units`. Cheaper than creating
+        an ArchiveDataPoint for each value in large archives.
+        """
+        columns = self._columns()
+        column_addresses = [address for address, _ in columns]
+        column_units = [unit for _, unit in columns]
+        datetime_index = self.datetime_position - 1
+        utc_offset = self.utc_offset
+
+        timestamps = list()
+        values = list()
+        addresses = list()
+        units = list()
+        for line in self.values.data_block.data_lines:
+            data_sets = line.data_sets
+            timestamp = parse_datetime(data_sets[datetime_index].value, utc_offset)
+            self._check_line_length(line, columns)
+            amount = len(data_sets)
+            timestamps.extend([timestamp] * amount)
+            values.extend([data_set.value for data_set in data_sets])
+            addresses.extend(column_addresses[:amount])
+            units.extend(column_units[:amount])
+
+        return {
+            "timestamps": timestamps,
+            "values": values,
+            "addresses": addresses,
+            "units": units,
+        }
 
 
 class Lis200Exception(Exception):
@@ -367,19 +445,12 @@ class Lis200ErrorParser(exceptions.Iec6206521BaseErrorParser):
         249: EncodeChangeError,
     }
 
-    def __init__(self):
-        super().__init__()
-        self.regex_for_error = re.compile(r"^#(\d{4})")
-
     def check_for_errors(self, answer_response):
-        errors = list()
         for item in answer_response.data:
-            error = re.search(self.regex_for_error, item.value)
-            if error:
-                error_text = error.group(1)
-                error_nr = int(error_text.lstrip("0"))
-                errors.append(error_nr)
-
-        # just raise the first error
-        if errors:
-            raise self.ERROR_MAP[errors[0]]()
+            value = item.value
+            # Most values are measurements, only run the regex on possible errors.
+            if value and value[:1] == "#":
+                error = _ERROR_RE.match(value)
+                if error:
+                    # just raise the first error
+                    raise self.ERROR_MAP[int(error.group(1))]()
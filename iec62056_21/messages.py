@@ -1,16 +1,22 @@
-import re
+import itertools
+import sys
 import typing
 
 from iec62056_21.exceptions import Iec6205621ParseError, ValidationError
 from iec62056_21 import constants, utils
 
-ENCODING = "latin-1"
-
+# Framing characters bound at module level as they are used in every message.
+_SOH = constants.SOH
+_STX = constants.STX
+_ETX = constants.ETX
+_ACK = constants.ACK
+_LINE_END = constants.LINE_END
+_START_CHAR = constants.START_CHAR
+_END_CHAR = constants.END_CHAR
+_REQUEST_CHAR = constants.REQUEST_CHAR
+_STX_BYTES = constants.STX.encode(constants.ENCODING)
 
-# Regex to be used for parsing data. Compiled once for reuse later.
-regex_data_set = re.compile(r"^(.+)\((.*)\)")
-regex_data_set_data = re.compile(r"^(.*)\*(.*)")
-regex_data_just_value = re.compile(r"^\((.*)\)")
+ENCODING = "latin-1"
 
 
 class Iec6205621Data:
@@ -18,6 +24,8 @@ class Iec6205621Data:
     Base class for IEC 62056-21 messages.
     """
 
+    __slots__ = ()
+
     def to_representation(self):
         raise NotImplementedError("Needs to be implemented in subclass")
 
@@ -40,57 +48,128 @@ class Iec6205621Data:
         return cls.from_representation(bytes_data.decode(constants.ENCODING))
 
 
-class DataSet(Iec6205621Data):
+class _CachedIec6205621Data(Iec6205621Data):
+    """
+    Base class for data that caches its representation and bytes the first time
+    they are created. Setting a public attribute clears both caches, so changed
+    data is serialized again.
+    """
+
+    __slots__ = ("_representation", "_bytes")
+
+    def __init__(self):
+        self._representation = None
+        self._bytes = None
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if not name.startswith("_"):
+            object.__setattr__(self, "_representation", None)
+            object.__setattr__(self, "_bytes", None)
+
+    def _build_representation(self):
+        raise NotImplementedError("Needs to be implemented in subclass")
+
+    def to_representation(self):
+        if self._representation is None:
+            self._representation = self._build_representation()
+        return self._representation
+
+    def to_bytes(self):
+        if self._bytes is None:
+            self._bytes = self.to_representation().encode(constants.ENCODING)
+        return self._bytes
 
+
+class DataSet(_CachedIec6205621Data):
     """
     The data set is the smallest component of a response.
     It consists of an address and value with optional unit. in the format of
     {address}({value}*{unit})
     """
 
+    __slots__ = ("address", "value", "unit")
+
     EXCLUDE_CHARS = ["(", ")", "/", "!"]
 
     def __init__(self, value: str, address: str = None, unit: str = None):
 
         # TODO: in programming mode, protocol mode C the value can be up to 128 chars
 
+        super().__init__()
         self.address = address
         self.value = value
         self.unit = unit
 
-    def to_representation(self) -> str:
+    def _build_representation(self) -> str:
         if self.unit is not None and self.address is not None:
             return f"{self.address}({self.value}*{self.unit})"
         elif self.address is not None and self.unit is None:
             return f"{self.address}({self.value})"
         else:
             if self.value is None:
-                return f"()"
+                return "()"
             else:
                 return f"({self.value})"
 
     @classmethod
     def from_representation(cls, data_set_string):
-        just_value = regex_data_just_value.search(data_set_string)
+        # Data sets are split on the parenthesis with plain string operations.
+        # Anything after the last closing parenthesis is ignored.
+        if not data_set_string.endswith(")"):
+            data_set_string = data_set_string[: data_set_string.rfind(")") + 1]
 
-        if just_value:
-            return cls(address=None, value=just_value.group(1), unit=None)
+        if data_set_string.startswith("("):
+            return cls(address=None, value=data_set_string[1:-1], unit=None)
 
-        first_match = regex_data_set.search(data_set_string)
-        if not first_match:
+        address, _, values_data = data_set_string[:-1].rpartition("(")
+        if not address:
             raise Iec6205621ParseError(
                 f"Unable to find address and data in {data_set_string}"
             )
-        address = first_match.group(1)
-        values_data = first_match.group(2)
-        second_match = regex_data_set_data.search(values_data)
-        if second_match:
+
+        value, unit_separator, unit = values_data.rpartition("*")
+        if unit_separator:
+            # Units come from a small set, interning them lets all the data sets
+            # of a readout share the same string objects.
+            return cls(address=address, value=value, unit=sys.intern(unit))
+        # Without a unit separator the whole values data ends up in unit.
+        return cls(address=address, value=unit, unit=None)
+
+    @classmethod
+    def from_bytes(cls, bytes_data):
+        """
+        Parses the data set directly from bytes and only decodes the fields.
+        """
+        if not bytes_data.endswith(b")"):
+            bytes_data = bytes_data[: bytes_data.rfind(b")") + 1]
+
+        if bytes_data.startswith(b"("):
             return cls(
-                address=address, value=second_match.group(1), unit=second_match.group(2)
+                address=None,
+                value=bytes_data[1:-1].decode(constants.ENCODING),
+                unit=None,
             )
 
-        else:
-            return cls(address=address, value=values_data, unit=None)
+        address, _, values_data = bytes_data[:-1].rpartition(b"(")
+        if not address:
+            raise Iec6205621ParseError(
+                f"Unable to find address and data in {bytes_data!r}"
+            )
+
+        value, unit_separator, unit = values_data.rpartition(b"*")
+        if unit_separator:
+            return cls(
+                address=address.decode(constants.ENCODING),
+                value=value.decode(constants.ENCODING),
+                unit=sys.intern(unit.decode(constants.ENCODING)),
+            )
+        # Without a unit separator the whole values data ends up in unit.
+        return cls(
+            address=address.decode(constants.ENCODING),
+            value=unit.decode(constants.ENCODING),
+            unit=None,
+        )
 
     def __repr__(self):
         return (
@@ -107,6 +186,8 @@ class DataLine(Iec6205621Data):
     A data line is a list of data sets.
     """
 
+    __slots__ = ("data_sets",)
+
     def __init__(self, data_sets):
         self.data_sets: typing.List[DataSet] = data_sets
 
@@ -121,15 +202,21 @@ class DataLine(Iec6205621Data):
         need to split after each ")"
         """
         separator = ")"
-        data_sets = list()
-        _string_data = string_data
-        for x in range(0, string_data.count(separator)):
-            index = _string_data.find(separator) + 1
-            data_set_string = _string_data[:index]
-            _string_data = _string_data[index:]
-            data_set = DataSet.from_representation(data_set_string=data_set_string)
-            data_sets.append(data_set)
+        # Anything after the last separator is not a data set.
+        data_sets = [
+            DataSet.from_representation(data_set_string=data_set_string + separator)
+            for data_set_string in string_data.split(separator)[:-1]
+        ]
+        return cls(data_sets=data_sets)
 
+    @classmethod
+    def from_bytes(cls, bytes_data):
+        separator = b")"
+        # Anything after the last separator is not a data set.
+        data_sets = [
+            DataSet.from_bytes(data_set_bytes + separator)
+            for data_set_bytes in bytes_data.split(separator)[:-1]
+        ]
         return cls(data_sets=data_sets)
 
     def __repr__(self):
@@ -142,42 +229,66 @@ class DataBlock(Iec6205621Data):
     \n\r
     """
 
+    __slots__ = ("data_lines",)
+
     def __init__(self, data_lines):
         self.data_lines = data_lines
 
     def to_representation(self):
-        lines_rep = [
-            (line.to_representation() + constants.LINE_END) for line in self.data_lines
-        ]
-        return "".join(lines_rep)
+        if not self.data_lines:
+            return ""
+        return (
+            _LINE_END.join([line.to_representation() for line in self.data_lines])
+            + _LINE_END
+        )
 
     @classmethod
     def from_representation(cls, string_data: str):
-        lines = string_data.splitlines()
+        # Lines always end with CR LF so a plain split is enough. The empty string
+        # after the last line ending is dropped.
+        lines = string_data.split(_LINE_END)
+        if not lines[-1]:
+            lines.pop()
         data_lines = [DataLine.from_representation(line) for line in lines]
         return cls(data_lines)
 
+    @classmethod
+    def from_bytes(cls, bytes_data: bytes):
+        return cls._from_byte_lines(utils.split_lines(bytes_data))
+
+    @classmethod
+    def _from_byte_lines(cls, lines: typing.List[bytes]):
+        data_lines = [DataLine.from_bytes(line) for line in lines]
+        return cls(data_lines)
+
     def __repr__(self):
         return f"{self.__class__.__name__}(data_lines={self.data_lines!r})"
 
 
 class ReadoutDataMessage(Iec6205621Data):
+    __slots__ = ("data_block",)
+
     def __init__(self, data_block):
         self.data_block = data_block
 
     def to_representation(self):
-        data = (
-            f"{constants.STX}{self.data_block.to_representation()}{constants.END_CHAR}"
-            f"{constants.LINE_END}{constants.ETX}"
+        data = "".join(
+            (
+                _STX,
+                self.data_block.to_representation(),
+                _END_CHAR,
+                _LINE_END,
+                _ETX,
+            )
         )
 
         return utils.add_bcc(data)
 
     @classmethod
-    def from_representation(cls, string_data: str):
+    def from_representation(cls, string_data: str, verify_bcc: bool = True):
         _in_data = string_data
 
-        if not utils.bcc_valid(string_data):
+        if verify_bcc and not utils.bcc_valid(string_data):
             raise ValueError("BCC not valid")
 
         _in_data = _in_data[1:-5]  # remove stx and !<cr><lf>ETX bcc
@@ -186,13 +297,26 @@ class ReadoutDataMessage(Iec6205621Data):
 
         return cls(data_block=data_block)
 
+    @classmethod
+    def from_bytes(cls, bytes_data: bytes, verify_bcc: bool = True):
+        # remove stx and !<cr><lf>ETX bcc
+        if verify_bcc:
+            lines = utils.split_lines_verifying_bcc(bytes_data, 1, -5)
+        else:
+            lines = utils.split_lines(bytes_data[1:-5])
+        data_block = DataBlock._from_byte_lines(lines)
+
+        return cls(data_block=data_block)
+
     def __repr__(self):
         return f"{self.__class__.__name__}(data_block={self.data_block!r})"
 
 
 class CommandMessage(Iec6205621Data):
-    allowed_commands = ["P", "W", "R", "E", "B"]
-    allowed_command_types = ["0", "1", "2", "3", "4", "5", "6", "7", "8", "9"]
+    __slots__ = ("command", "command_type", "data_set")
+
+    allowed_commands = frozenset(("P", "W", "R", "E", "B"))
+    allowed_command_types = frozenset("0123456789")
 
     def __init__(
         self, command: str, command_type: str, data_set: typing.Optional[DataSet]
@@ -207,27 +331,51 @@ class CommandMessage(Iec6205621Data):
             raise ValueError(f"{command_type} is not an allowed command type")
 
     def to_representation(self):
-        header = f"{constants.SOH}{self.command}{self.command_type}"
         if self.data_set:
-            body = f"{constants.STX}{self.data_set.to_representation()}{constants.ETX}"
+            message = "".join(
+                (
+                    _SOH,
+                    self.command,
+                    self.command_type,
+                    _STX,
+                    self.data_set.to_representation(),
+                    _ETX,
+                )
+            )
         else:
-            body = f"{constants.ETX}"
-
-        message = f"{header}{body}"
+            message = "".join((_SOH, self.command, self.command_type, _ETX))
 
         return utils.add_bcc(message)
 
     @classmethod
-    def from_representation(cls, string_data):
-        if not utils.bcc_valid(string_data):
+    def from_representation(cls, string_data, verify_bcc: bool = True):
+        if verify_bcc and not utils.bcc_valid(string_data):
             raise ValueError("BCC not valid")
-        _message = string_data[:-1]  # remove bcc
-        header = _message[:3]
-        body = _message[3:]
+        # Fixed layout: SOH, command, command type, [STX data set] ETX, BCC
+        command = string_data[1]
+        command_type = string_data[2]
+        if string_data[3] == _STX:
+            data_set = DataSet.from_representation(string_data[4:-2])
+        else:
+            # No data set, like the break command.
+            data_set = None
+
+        return cls(command, command_type, data_set)
 
-        command = header[1]
-        command_type = header[2]
-        data_set = DataSet.from_representation(body[1:-1])
+    @classmethod
+    def from_bytes(cls, bytes_data: bytes, verify_bcc: bool = True):
+        """
+        Parses the command directly from bytes and only decodes the fields.
+        """
+        if verify_bcc and not utils.bcc_valid(bytes_data):
+            raise ValueError("BCC not valid")
+        command = bytes_data[1:2].decode(constants.ENCODING)
+        command_type = bytes_data[2:3].decode(constants.ENCODING)
+        if bytes_data[3:4] == _STX_BYTES:
+            data_set = DataSet.from_bytes(bytes_data[4:-2])
+        else:
+            # No data set, like the break command.
+            data_set = None
 
         return cls(command, command_type, data_set)
 
@@ -256,37 +404,37 @@ class CommandMessage(Iec6205621Data):
 
 
 class AnswerDataMessage(Iec6205621Data):
+    __slots__ = ("data_block", "_data")
+
     def __init__(self, data_block):
         self.data_block = data_block
         self._data = None
 
     @property
     def data(self):
-        if not self._data:
+        if self._data is None:
             self._get_all_data_sets()
 
         return self._data
 
     def _get_all_data_sets(self):
-        data_sets = list()
-
-        for line in self.data_block.data_lines:
-            for set in line.data_sets:
-                data_sets.append(set)
-
-        self._data = data_sets
+        self._data = list(
+            itertools.chain.from_iterable(
+                line.data_sets for line in self.data_block.data_lines
+            )
+        )
 
     def to_representation(self):
         # TODO: this is not valid in case reading out partial blocks.
-        rep = f"{constants.STX}{self.data_block.to_representation()}{constants.ETX}"
+        rep = "".join((_STX, self.data_block.to_representation(), _ETX))
 
         return utils.add_bcc(rep)
 
     @classmethod
-    def from_representation(cls, string_data):
+    def from_representation(cls, string_data, verify_bcc: bool = True):
         _in_data = string_data
 
-        if not utils.bcc_valid(string_data):
+        if verify_bcc and not utils.bcc_valid(string_data):
             raise ValueError("BCC not valid")
 
         _in_data = _in_data[1:-2]  # remove stx -- etx bcc
@@ -295,18 +443,31 @@ class AnswerDataMessage(Iec6205621Data):
 
         return cls(data_block=data_block)
 
+    @classmethod
+    def from_bytes(cls, bytes_data: bytes, verify_bcc: bool = True):
+        # remove stx -- etx bcc
+        if verify_bcc:
+            lines = utils.split_lines_verifying_bcc(bytes_data, 1, -2)
+        else:
+            lines = utils.split_lines(bytes_data[1:-2])
+        data_block = DataBlock._from_byte_lines(lines)
+
+        return cls(data_block=data_block)
+
     def __repr__(self):
         return f"{self.__class__.__name__}(data_block={self.data_block!r})"
 
 
 class RequestMessage(Iec6205621Data):
+    __slots__ = ("device_address",)
+
     def __init__(self, device_address=""):
         self.device_address = device_address
 
     def to_representation(self):
         return (
-            f"{constants.START_CHAR}{constants.REQUEST_CHAR}{self.device_address}"
-            f"{constants.END_CHAR}{constants.LINE_END}"
+            f"{_START_CHAR}{_REQUEST_CHAR}{self.device_address}"
+            f"{_END_CHAR}{_LINE_END}"
         )
 
     @classmethod
@@ -323,12 +484,14 @@ class AckOptionSelectMessage(Iec6205621Data):
     Only support protocol mode 0: Normal
     """
 
+    __slots__ = ("baud_char", "mode_char")
+
     def __init__(self, baud_char, mode_char):
         self.baud_char = baud_char
         self.mode_char = mode_char
 
     def to_representation(self):
-        return f"{constants.ACK}0{self.baud_char}{self.mode_char}{constants.LINE_END}"
+        return f"{_ACK}0{self.baud_char}{self.mode_char}{_LINE_END}"
 
     @classmethod
     def from_representation(cls, string_data):
@@ -346,6 +509,8 @@ class AckOptionSelectMessage(Iec6205621Data):
 
 
 class IdentificationMessage(Iec6205621Data):
+    __slots__ = ("identification", "manufacturer", "switchover_baudrate_char")
+
     def __init__(
         self, identification: str, manufacturer: str, switchover_baudrate_char: str
     ):
@@ -355,8 +520,8 @@ class IdentificationMessage(Iec6205621Data):
 
     def to_representation(self):
         return (
-            f"{constants.START_CHAR}{self.manufacturer}{self.switchover_baudrate_char}\\"
-            f"{self.identification}{constants.LINE_END}"
+            f"{_START_CHAR}{self.manufacturer}{self.switchover_baudrate_char}\\"
+            f"{self.identification}{_LINE_END}"
         )
 
     @classmethod
@@ -8,6 +8,16 @@ from iec62056_21 import utils, exceptions, constants
 
 logger = logging.getLogger(__name__)
 
+_SOH = constants.SOH.encode(constants.ENCODING)
+_STX = constants.STX.encode(constants.ENCODING)
+_ETX = constants.ETX.encode(constants.ENCODING)
+_EOT = constants.EOT.encode(constants.ENCODING)
+_ACK = constants.ACK.encode(constants.ENCODING)
+_NACK = constants.NACK.encode(constants.ENCODING)
+_LINE_END = constants.LINE_END.encode(constants.ENCODING)
+_START_CHARS = (_SOH, _STX)
+_END_CHARS = (_ETX, _EOT)
+
 
 class TransportError(Exception):
     """General transport error"""
@@ -19,9 +29,11 @@ class BaseTransport:
     """
 
     TRANSPORT_REQUIRES_ADDRESS: bool = True
+    RECV_CHUNK_SIZE: int = 4096
 
     def __init__(self, timeout: int = 30):
         self.timeout = timeout
+        self._read_buffer = bytearray()
 
     def connect(self) -> None:
         raise NotImplemented("Must be defined in subclass")
@@ -38,10 +50,8 @@ class BaseTransport:
         :param timeout:
         :return:
         """
-        start_chars = [b"\x01", b"\x02"]
-        end_chars = [b"\x03", b"\x04"]
-        total_data = b""
-        packets = 0
+        total_data = bytearray()
+        first_packet = True
         start_char_received = False
         start_char = None
         end_char = None
@@ -49,86 +59,68 @@ class BaseTransport:
 
         while True:
 
-            in_data = b""
-            duration: float = 0.0
-            start_time = time.time()
-            while True:
-                b = self.recv(1)
-
-                duration = time.time() - start_time
-                if duration > self.timeout:
-                    raise TimeoutError(f"Read in {self.__class__.__name__} timed out")
-                if not start_char_received:
-                    # is start char?
-                    if b in start_chars:
-                        in_data += b
-                        start_char_received = True
-                        start_char = b
-                        continue
-                    else:
-                        continue
-                else:
-                    # is end char?
-                    if b in end_chars:
-                        in_data += b
-                        end_char = b
-                        break
-                    else:
-                        in_data += b
-                        continue
-
-            packets += 1
+            deadline = time.monotonic() + timeout
+            if not start_char_received:
+                # Anything before the start char is discarded.
+                start_char = self._read_until(_START_CHARS, deadline)[-1:]
+                start_char_received = True
+                in_data = start_char + self._read_until(_END_CHARS, deadline)
+            else:
+                in_data = self._read_until(_END_CHARS, deadline)
+            end_char = in_data[-1:]
 
+            # The BCC covers everything after the start char up to and including the
+            # end char. It is checked directly against the received BCC instead of
+            # recreating the whole message to compare with.
+            calculated_bcc = utils.bcc_update(0, in_data[1:])
             bcc = self.recv(1)
+            bcc_valid = bcc == bytes((calculated_bcc,))
             in_data += bcc
             logger.debug(
                 f"Received {in_data!r} over transport: {self.__class__.__name__}"
             )
 
-            if start_char == b"\x01":
+            if start_char == _SOH:
                 # This is a command message, probably Password challange.
                 total_data += in_data
                 break
 
-            if end_char == b"\x04":  # EOT (partial read)
+            if end_char == _EOT:  # EOT (partial read)
                 # we received a partial block
-                if not utils.bcc_valid(in_data):
+                if not bcc_valid:
                     # Nack and read again
-                    self.send(constants.NACK.encode(constants.ENCODING))
+                    self.send(_NACK)
                     continue
                 else:
                     # ack and read next
-                    self.send(constants.ACK.encode(constants.ENCODING))
-                    # remove bcc and eot and add line end.
-                    in_data = in_data[:-2] + constants.LINE_END.encode(
-                        constants.ENCODING
-                    )
-                    if packets > 1:
-                        # remove the leading STX
-                        in_data = in_data[1:]
-
-                    total_data += in_data
+                    self.send(_ACK)
+                    # remove bcc and eot and add line end. The leading STX is only
+                    # kept for the first packet.
+                    total_data += in_data[:-2] if first_packet else in_data[1:-2]
+                    total_data += _LINE_END
+                    first_packet = False
                     continue
 
-            if end_char == b"\x03":
+            if end_char == _ETX:
                 # Either it was the only message or we got the last message.
-                if not utils.bcc_valid(in_data):
+                if not bcc_valid:
                     # Nack and read again
-                    self.send(constants.NACK.encode(constants.ENCODING))
+                    self.send(_NACK)
                     continue
                 else:
-                    if packets > 1:
-                        in_data = in_data[1:]  # removing the leading STX
-                    total_data += in_data
-                    if packets > 1:
+                    if first_packet:
+                        total_data += in_data
+                    else:
+                        total_data += in_data[1:]  # removing the leading STX
                         # The last bcc is not correct compared to the whole
                         # message. But we have verified all the bccs along the way so
                         # we just compute it so the message is usable.
-                        total_data = utils.add_bcc(total_data[:-1])
+                        # The message starts with STX so the BCC starts after it.
+                        total_data = utils.add_bcc(total_data[:-1], start_index=1)
 
                     break
 
-        return total_data
+        return bytes(total_data)
 
     def simple_read(
         self,
@@ -142,36 +134,59 @@ class BaseTransport:
         _start_char = utils.ensure_bytes(start_char)
         _end_char = utils.ensure_bytes(end_char)
 
-        in_data = b""
-        start_char_received = False
         timeout = timeout or self.timeout
-        duration: float = 0.0
-        start_time = time.time()
-        while True:
-            b = self.recv(1)
-            duration = time.time() - start_time
-            if duration > self.timeout:
-                raise TimeoutError(f"Read in {self.__class__.__name__} timed out")
-            if not start_char_received:
-                # is start char?
-                if b == _start_char:
-                    in_data += b
-                    start_char_received = True
-                    continue
-                else:
-                    continue
-            else:
-                # is end char?
-                if b == _end_char:
-                    in_data += b
-                    break
-                else:
-                    in_data += b
-                    continue
+        deadline = time.monotonic() + timeout
+
+        # Anything before the start char is discarded.
+        self._read_until((_start_char,), deadline)
+        in_data = _start_char + self._read_until((_end_char,), deadline)
 
         logger.debug(f"Received {in_data!r} over transport: {self.__class__.__name__}")
         return in_data
 
+    def _read_until(self, chars: Tuple[bytes, ...], deadline: float) -> bytes:
+        """
+        Reads from the transport until any of chars is received. Returns all data up
+        to and including the found char. The data is received in chunks and searched
+        with bytes.find instead of checking one byte at a time.
+
+        :param chars:
+        :param deadline: time.monotonic() value after which the read times out.
+        """
+        buffer = self._read_buffer
+        searched = 0
+        while True:
+            found = [i for i in (buffer.find(c, searched) for c in chars) if i != -1]
+            if found:
+                end = min(found) + 1
+                data = bytes(buffer[:end])
+                del buffer[:end]
+                return data
+            searched = len(buffer)
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Read in {self.__class__.__name__} timed out")
+            self._fill_read_buffer()
+
+    def _fill_read_buffer(self) -> int:
+        """
+        Receives the next chunk of data into the read buffer. Returns the number of
+        bytes received.
+        """
+        chunk = self._recv_chunk()
+        self._read_buffer += chunk
+        return len(chunk)
+
+    def _recv_chunk(self) -> Union[bytes, memoryview]:
+        """
+        Receives the data that is available on the transport, at most
+        RECV_CHUNK_SIZE bytes.
+
+        _recv(chars) may block until it has received all chars, so by default only
+        one byte is asked for. Transports that can tell how much data is available
+        should override this to receive it all at once.
+        """
+        return self._recv(1)
+
     def send(self, data: bytes) -> None:
         """
         Will send data over the transport
@@ -191,11 +206,21 @@ class BaseTransport:
 
     def recv(self, chars: int) -> bytes:
         """
-        Will receive data over the transport.
+        Will receive data over the transport. Data is received in chunks and kept in
+        a read buffer so reading a message one byte at a time doesn't need one read
+        on the transport per byte.
+
+        Returns fewer than chars bytes only if the transport stops delivering data,
+        like on a serial port read timeout.
 
         :param chars:
         """
-        return self._recv(chars)
+        while len(self._read_buffer) < chars:
+            if not self._fill_read_buffer():
+                break
+        data = bytes(self._read_buffer[:chars])
+        del self._read_buffer[:chars]
+        return data
 
     def _recv(self, chars: int) -> bytes:
         """
@@ -224,11 +249,12 @@ class SerialTransport(BaseTransport):
 
     TRANSPORT_REQUIRES_ADDRESS = False
 
-    def __init__(self, port: str, timeout: int = 10):
+    def __init__(self, port: str, timeout: int = 10, low_latency: bool = False):
 
         super().__init__(timeout=timeout)
         self.port_name: str = port
         self.port: Optional[serial.Serial] = None
+        self.low_latency = low_latency
 
     def connect(self, baudrate: int = 300) -> None:
         """
@@ -246,6 +272,7 @@ class SerialTransport(BaseTransport):
             dsrdtr=False,
             xonxoff=False,
         )
+        self._set_low_latency_mode()
 
     def disconnect(self) -> None:
         """
@@ -256,6 +283,7 @@ class SerialTransport(BaseTransport):
 
         self.port.close()
         self.port = None
+        self._read_buffer.clear()
 
     def _send(self, data: bytes) -> None:
         """
@@ -280,6 +308,16 @@ class SerialTransport(BaseTransport):
 
         return self.port.read(chars)
 
+    def _recv_chunk(self) -> bytes:
+        """
+        Receives what is waiting on the serial port. Asking for more than that would
+        block until the read timeout so at least one byte is waited for.
+        """
+        if self.port is None:
+            raise TransportError("Serial port is closed.")
+
+        return self._recv(min(self.port.in_waiting, self.RECV_CHUNK_SIZE) or 1)
+
     def switch_baudrate(self, baud: int) -> None:
         """
         Creates a new serial port with the correct baudrate.
@@ -302,6 +340,20 @@ class SerialTransport(BaseTransport):
             dsrdtr=False,
             xonxoff=False,
         )
+        self._set_low_latency_mode()
+
+    def _set_low_latency_mode(self) -> None:
+        """
+        USB serial converters can hold received data for several milliseconds before
+        passing it on. Low latency mode makes the driver pass it on directly. It is
+        only available on Linux and not supported by all drivers.
+        """
+        if not self.low_latency:
+            return
+        try:
+            self.port.set_low_latency_mode(True)
+        except (AttributeError, IOError, OSError, ValueError):
+            logger.warning(f"Low latency mode is not supported on {self.port_name}")
 
     def __repr__(self):
         return (
@@ -312,7 +364,6 @@ class SerialTransport(BaseTransport):
 
 
 class TcpTransport(BaseTransport):
-
     """
     Transport class for TCP/IP communication.
     """
@@ -322,6 +373,7 @@ class TcpTransport(BaseTransport):
         super().__init__(timeout=timeout)
         self.address = address
         self.socket: Optional[socket.socket] = self._get_socket()
+        self._recv_buffer = memoryview(bytearray(self.RECV_CHUNK_SIZE))
 
     def connect(self) -> None:
         """
@@ -342,6 +394,7 @@ class TcpTransport(BaseTransport):
 
         self.socket.close()
         self.socket = None
+        self._read_buffer.clear()
 
     def _send(self, data: bytes) -> None:
         """
@@ -369,6 +422,20 @@ class TcpTransport(BaseTransport):
             raise TransportError from e
         return b
 
+    def _recv_chunk(self) -> memoryview:
+        """
+        Receives what is available on the socket into a preallocated buffer so no
+        new bytes object is created per receive.
+        """
+        if self.socket is None:
+            raise TransportError("Socket is closed")
+
+        try:
+            received = self.socket.recv_into(self._recv_buffer)
+        except (OSError, IOError, socket.timeout, socket.error) as e:
+            raise TransportError from e
+        return self._recv_buffer[:received]
+
     def switch_baudrate(self, baud: int) -> None:
         """
         Baudrate has not meaning in TCP/IP so we just dont do anything.
@@ -382,6 +449,9 @@ class TcpTransport(BaseTransport):
         Create a correct socket.
         """
         s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # Requests are small and the device waits for them before answering, so
+        # they should not be held back by Nagle's algorithm.
+        s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
         s.settimeout(self.timeout)
         return s
 
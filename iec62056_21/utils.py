@@ -1,44 +1,78 @@
+from typing import Optional
+
 from iec62056_21 import constants
 
+_LINE_END = constants.LINE_END.encode(constants.ENCODING)
+
 
 def bcc_valid(message):
-    bcc = message[-1]
-    to_calc = message[:-1]
-    calc = add_bcc(to_calc)
-    if message == calc:
-        return True
-    else:
-        return False
+    """
+    Checks the BCC at the end of the message. Only the BCC is compared so no copy of
+    the message with a recalculated BCC is made.
+    """
+    if isinstance(message, str):
+        message = message.encode(constants.ENCODING)
+    data = message[:-1]
+    start_bcc_index = _find_bcc_start_index(data)
+    return _calculate_bcc(data[start_bcc_index:]) == message[-1:]
+
+
+def split_lines_verifying_bcc(message: bytes, start: int, end: int):
+    """
+    Returns the data between start and end split into lines, after checking the BCC
+    at the end of the message with bcc_valid. Raises ValueError if the BCC is not
+    valid.
+    """
+    if not bcc_valid(message):
+        raise ValueError("BCC not valid")
+    return split_lines(message[start:end])
+
+
+def split_lines(data: bytes):
+    """
+    Splits data on CR LF, dropping the empty part after a trailing line ending.
+    """
+    lines = data.split(_LINE_END)
+    if not lines[-1]:
+        lines.pop()
+    return lines
 
 
-def add_bcc(message):
+def add_bcc(message, start_index: Optional[int] = None):
     """
     Returns the message with BCC added.
     Data to use starts after STX and ends with but includes ETX
     If there is a SOH in the message the calculation should be done from there.
+    If the caller already knows where the BCC calculation starts, it can be given
+    as start_index to avoid searching the message for SOH and STX.
     """
 
     if isinstance(message, str):
         _message = message.encode(constants.ENCODING)
-        return _add_bcc(_message).decode(constants.ENCODING)
-    return _add_bcc(message)
+        return _add_bcc(_message, start_index).decode(constants.ENCODING)
+    return _add_bcc(message, start_index)
 
 
-def _add_bcc(message: bytes):
-    start_bcc_index = 1
+def _add_bcc(message: bytes, start_index: Optional[int] = None):
+    if start_index is not None:
+        start_bcc_index = start_index
+    else:
+        start_bcc_index = _find_bcc_start_index(message)
+
+    data_for_bcc = message[start_bcc_index:]
+    bcc = calculate_bcc(data_for_bcc)
+    return message + bcc
+
+
+def _find_bcc_start_index(message: bytes) -> int:
     soh_index = message.find(constants.SOH.encode(constants.ENCODING))
     if soh_index == -1:
         # SOH not found
         stx_index = message.find(constants.STX.encode(constants.ENCODING))
         if stx_index == -1:
             raise IndexError("No SOH or STX found i message")
-        start_bcc_index = stx_index + 1
-    else:
-        start_bcc_index = soh_index + 1
-
-    data_for_bcc = message[start_bcc_index:]
-    bcc = calculate_bcc(data_for_bcc)
-    return message + bcc
+        return stx_index + 1
+    return soh_index + 1
 
 
 def calculate_bcc(data):
@@ -53,15 +87,33 @@ def calculate_bcc(data):
 
 
 def _calculate_bcc(bytes_data: bytes):
-    bcc = 0
-    for b in bytes_data:
-        x = b & 0x7F
-        bcc ^= x
-        bcc &= 0x7F
+    bcc = bcc_update(0, bytes_data)
     return bcc.to_bytes(length=1, byteorder="big")
 
 
+def bcc_update(bcc: int, bytes_data: bytes) -> int:
+    """
+    Returns the BCC continued from bcc over bytes_data. As the BCC is an XOR it can
+    be calculated over data that arrives in several parts.
+    """
+    # The data is read as one big integer and the upper half is XOR:ed onto the
+    # lower half until a single byte is left. This keeps the work in C instead of
+    # looping over every byte in Python.
+    # Masking each byte to 7 bits gives the same result as masking the XOR of them
+    # all, so the masking is done once at the end.
+    length = len(bytes_data)
+    value = int.from_bytes(bytes_data, "little")
+    while length > 1:
+        half = (length + 1) // 2
+        shift = half * 8
+        value = (value >> shift) ^ (value & ((1 << shift) - 1))
+        length = half
+    return (bcc ^ value) & 0x7F
+
+
 def ensure_bytes(data):
+    if type(data) is bytes:
+        return data
     if isinstance(data, str):
         return data.encode(constants.ENCODING)
     elif isinstance(data, bytes):
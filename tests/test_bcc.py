@@ -1,6 +1,12 @@
 import pytest
 
-from iec62056_21.utils import calculate_bcc, add_bcc
+from iec62056_21.utils import (
+    calculate_bcc,
+    add_bcc,
+    bcc_update,
+    bcc_valid,
+    split_lines_verifying_bcc,
+)
 
 
 class TestBcc:
@@ -27,3 +33,54 @@ class TestBcc:
         correct_data = "\x01P0\x02(1234567)\x03P"
         with_bcc = add_bcc(data)
         assert with_bcc == correct_data
+
+    def test_add_bcc_with_start_index(self):
+        data = b"\x02(1)\x01(2)\x03"
+        assert add_bcc(data, start_index=1) == data + calculate_bcc(data[1:])
+
+    @pytest.mark.parametrize(
+        "message", ["\x01P0\x02(1234567)\x03P", b"\x01P0\x02(1234567)\x03P"]
+    )
+    def test_bcc_valid(self, message):
+        assert bcc_valid(message)
+
+    @pytest.mark.parametrize(
+        "message", ["\x01P0\x02(1234567)\x03Q", b"\x01P0\x02(1234567)\x03Q"]
+    )
+    def test_bcc_not_valid(self, message):
+        assert not bcc_valid(message)
+
+    def test_split_lines_verifying_bcc(self):
+        data = b"\x023:171.0(0)\r\n3:172.0(1)\x03\x06"
+        lines = split_lines_verifying_bcc(data, 1, -2)
+        assert lines == [b"3:171.0(0)", b"3:172.0(1)"]
+
+    def test_split_lines_verifying_bcc_starts_after_soh(self):
+        data = add_bcc(b"\x01P0\x02(1234567)\x03")
+        lines = split_lines_verifying_bcc(data, 4, -2)
+        assert lines == [b"(1234567)"]
+
+    def test_split_lines_verifying_bcc_invalid_bcc(self):
+        data = b"\x023:171.0(0)\r\n3:172.0(1)\x03\x07"
+        with pytest.raises(ValueError):
+            split_lines_verifying_bcc(data, 1, -2)
+
+    def test_bcc_ignores_eighth_bit(self):
+        data = b"\x01P0\x02(1234567)\x03"
+        eight_bit_data = bytes(b | 0x80 for b in data)
+        assert calculate_bcc(eight_bit_data[1:]) == calculate_bcc(data[1:])
+
+    @pytest.mark.parametrize("length", [0, 1, 2, 3, 7, 8, 9, 255, 1000])
+    def test_bcc_matches_xor_of_all_bytes(self, length):
+        data = bytes((i * 37 + 11) % 256 for i in range(length))
+        expected = 0
+        for b in data:
+            expected ^= b & 0x7F
+        assert calculate_bcc(data) == bytes([expected])
+
+    def test_bcc_update_over_parts_matches_whole(self):
+        data = b"3:171.0(0)\r\n3:172.0(1)\x03"
+        bcc = 0
+        for part in (data[:5], data[5:6], data[6:]):
+            bcc = bcc_update(bcc, part)
+        assert bytes((bcc,)) == calculate_bcc(data)
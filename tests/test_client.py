@@ -1,5 +1,7 @@
+import types
+
 import pytest
-from iec62056_21 import exceptions, client, transports
+from iec62056_21 import exceptions, client, transports, messages, utils
 
 
 class TestIec6205621Client:
@@ -20,3 +22,264 @@ class TestIec6205621Client:
     def test_can_create_client_tcp_transport(self):
         trans = transports.TcpTransport(address=("192.168.1.1", 5000))
         c = client.Iec6205621Client(transport=trans, device_address="00000000")
+
+
+class FakeTransport(transports.BaseTransport):
+    """
+    Records everything sent so the client behaviour can be inspected.
+    """
+
+    TRANSPORT_REQUIRES_ADDRESS = False
+
+    def __init__(self, incoming=b""):
+        super().__init__(timeout=1)
+        self.incoming = incoming
+        self.sent = list()
+
+    def _send(self, data):
+        self.sent.append(data)
+
+    def _recv(self, chars=1):
+        data = self.incoming[:chars]
+        self.incoming = self.incoming[chars:]
+        return data
+
+    def switch_baudrate(self, baud):
+        pass
+
+
+class TestBatteryStartupSequence:
+    def test_null_chars_sent_in_one_write(self, monkeypatch):
+        monkeypatch.setattr(client.time, "sleep", lambda duration: None)
+        trans = FakeTransport()
+        c = client.Iec6205621Client(transport=trans, battery_powered=True)
+
+        c.send_battery_power_startup_sequence()
+
+        # 2.2 seconds of chars at 300 baud with 10 bits per char.
+        assert trans.sent == [b"\x00" * 66]
+
+    def test_null_chars_sized_for_port_baudrate(self, monkeypatch):
+        monkeypatch.setattr(client.time, "sleep", lambda duration: None)
+        trans = FakeTransport()
+        trans.port = types.SimpleNamespace(baudrate=2400)
+        c = client.Iec6205621Client(transport=trans, battery_powered=True)
+
+        c.send_battery_power_startup_sequence()
+
+        assert trans.sent == [b"\x00" * 528]
+
+
+class DuckTransport:
+    """
+    A transport that doesn't inherit from BaseTransport.
+    """
+
+    TRANSPORT_REQUIRES_ADDRESS = False
+
+    def __init__(self, incoming=b""):
+        self.incoming = incoming
+        self.sent = list()
+
+    def send(self, data):
+        self.sent.append(data)
+
+    def recv(self, chars):
+        data = self.incoming[:chars]
+        self.incoming = self.incoming[chars:]
+        return data
+
+
+class TestDuckTypedTransport:
+    def test_write_and_break_only_need_send_and_recv(self):
+        trans = DuckTransport(incoming=b"\x06")
+        c = client.Iec6205621Client(transport=trans)
+
+        c.write_single_value(address="1.8.0", data="123")
+        c.send_break()
+
+        assert trans.sent == [b"\x01W1\x021.8.0(123)\x03o", b"\x01B0\x03q"]
+
+
+class TestReadSingleValue:
+    def test_read_request_is_reused(self):
+        answer = utils.add_bcc(b"\x021.8.0(1*kWh)\r\n\x03")
+        trans = FakeTransport(incoming=answer * 2)
+        c = client.Iec6205621Client(transport=trans)
+
+        first = c.read_single_value(address="1.8.0")
+        second = c.read_single_value(address="1.8.0")
+
+        assert first.value == second.value == "1"
+        assert trans.sent == [b"\x01R1\x021.8.0(1)\x03k"] * 2
+        assert trans.sent[0] is trans.sent[1]
+
+
+class TestWriteSingleValue:
+    def test_ack_accepts_write(self):
+        trans = FakeTransport(incoming=b"\x06")
+        c = client.Iec6205621Client(transport=trans)
+
+        c.write_single_value(address="1.8.0", data="123")
+
+        assert trans.sent == [b"\x01W1\x021.8.0(123)\x03o"]
+
+    def test_write_int_value(self):
+        trans = FakeTransport(incoming=b"\x06")
+        c = client.Iec6205621Client(transport=trans)
+
+        c.write_single_value(address="1.8.0", data=123)
+
+        assert trans.sent == [b"\x01W1\x021.8.0(123)\x03o"]
+
+    def test_write_equal_values_of_different_types(self):
+        trans = FakeTransport(incoming=b"\x06")
+        c = client.Iec6205621Client(transport=trans)
+
+        c.write_single_value(address="4:150", data=1)
+        trans.incoming = b"\x06"
+        c.write_single_value(address="4:150", data=1.0)
+
+        assert trans.sent == [b"\x01W1\x024:150(1)\x03m", b"\x01W1\x024:150(1.0)\x03s"]
+
+    def test_nack_raises_value_error(self):
+        trans = FakeTransport(incoming=b"\x15")
+        c = client.Iec6205621Client(transport=trans)
+
+        with pytest.raises(ValueError, match=r"CommandMessage\("):
+            c.write_single_value(address="1.8.0", data="123")
+
+
+class TestReadResponse:
+    def test_password_challenge_is_command_message(self):
+        trans = FakeTransport(incoming=b"\x01P0\x02(1234567)\x03P")
+        c = client.Iec6205621Client(transport=trans)
+
+        response = c.read_response()
+
+        assert isinstance(response, messages.CommandMessage)
+        assert response.data_set.value == "1234567"
+
+    def test_answer_data_message(self):
+        trans = FakeTransport(incoming=b"\x021.8.0(100*kWh)\r\n\x03s")
+        c = client.Iec6205621Client(transport=trans)
+
+        response = c.read_response()
+
+        assert isinstance(response, messages.AnswerDataMessage)
+        assert response.data[0].value == "100"
+
+
+class TestRest:
+    def test_rest_blocks(self, monkeypatch):
+        sleeps = list()
+        monkeypatch.setattr(client.time, "sleep", sleeps.append)
+        trans = FakeTransport()
+        c = client.Iec6205621Client(transport=trans)
+
+        c.rest(10)
+        assert len(sleeps) == 1
+        assert 9 < sleeps[0] <= 10
+
+    def test_scheduled_rest_delays_next_send(self, monkeypatch):
+        sleeps = list()
+        monkeypatch.setattr(client.time, "sleep", sleeps.append)
+        trans = FakeTransport()
+        c = client.Iec6205621Client(transport=trans)
+
+        c._schedule_rest(10)
+        assert sleeps == []
+
+        c.send_break()
+        assert len(sleeps) == 1
+        assert 9 < sleeps[0] <= 10
+        assert trans.sent == [b"\x01B0\x03q"]
+
+    def test_no_wait_when_rest_is_over(self, monkeypatch):
+        sleeps = list()
+        monkeypatch.setattr(client.time, "sleep", sleeps.append)
+        trans = FakeTransport()
+        c = client.Iec6205621Client(transport=trans)
+
+        c.send_break()
+        assert sleeps == []
+
+
+class TestAckWithOptionSelect:
+    def test_invalid_mode_raises_value_error_before_sending(self):
+        trans = FakeTransport()
+        c = client.Iec6205621Client(transport=trans)
+
+        with pytest.raises(ValueError):
+            c.ack_with_option_select("not_a_mode")
+        assert trans.sent == []
+
+    def test_subclass_can_add_modes(self, monkeypatch):
+        monkeypatch.setattr(client.time, "sleep", lambda duration: None)
+
+        class CustomClient(client.Iec6205621Client):
+            MODE_CONTROL_CHARACTER = {"custom": "5"}
+
+        trans = FakeTransport()
+        c = CustomClient(transport=trans)
+        c._switchover_baudrate_char = "5"
+
+        c.ack_with_option_select("custom")
+
+        assert trans.sent == [b"\x06055\r\n"]
+
+    def test_allowed_modes_follow_mode_control_characters(self):
+        class CustomClient(client.Iec6205621Client):
+            MODE_CONTROL_CHARACTER = {"custom": "5"}
+
+        c = CustomClient(transport=FakeTransport())
+
+        assert c.ALLOWED_MODES == frozenset({"custom"})
+        with pytest.raises(AttributeError):
+            c.ALLOWED_MODES = frozenset({"readout"})
+
+
+class TestStartup:
+    def test_lower_case_manufacturer_uses_short_reaction_time(self, monkeypatch):
+        monkeypatch.setattr(client.time, "sleep", lambda duration: None)
+        trans = FakeTransport(incoming=b"/Els6\\2EK280\r\n")
+        c = client.Iec6205621Client(transport=trans)
+
+        c.startup()
+
+        assert c.manufacturer_id == "Els"
+        assert c.switchover_baudrate == 19200
+        assert c.use_short_reaction_time
+        assert c.reaction_time == c.SHORT_REACTION_TIME
+
+    def test_upper_case_manufacturer_uses_normal_reaction_time(self, monkeypatch):
+        monkeypatch.setattr(client.time, "sleep", lambda duration: None)
+        trans = FakeTransport(incoming=b"/ELS6\\2EK280\r\n")
+        c = client.Iec6205621Client(transport=trans)
+
+        c.startup()
+
+        assert not c.use_short_reaction_time
+        assert c.reaction_time == c.REACTION_TIME
+
+    def test_subclass_can_override_baudrates(self, monkeypatch):
+        monkeypatch.setattr(client.time, "sleep", lambda duration: None)
+
+        class CustomClient(client.Iec6205621Client):
+            BAUDRATES_MODE_C = {"6": 115200}
+
+        trans = FakeTransport(incoming=b"/Els6\\2EK280\r\n")
+        c = CustomClient(transport=trans)
+
+        c.startup()
+
+        assert c.switchover_baudrate == 115200
+
+    def test_sends_request_message(self, monkeypatch):
+        monkeypatch.setattr(client.time, "sleep", lambda duration: None)
+        trans = FakeTransport(incoming=b"/Els6\\2EK280\r\n")
+        c = client.Iec6205621Client(transport=trans, device_address="45678903")
+
+        c.startup()
+
+        assert trans.sent == [b"/?45678903!\r\n"]
@@ -26,6 +26,39 @@ class TestDataSets:
         ds = messages.DataSet(value="100", address="3.1.0", unit="kWh")
         assert ds.to_representation() == self.data_set_with_unit
 
+    def test_units_are_shared(self):
+        first = messages.DataSet.from_representation("1.8.0(1*kWh)")
+        second = messages.DataSet.from_bytes(b"2.8.0(2*kWh)")
+        assert first.unit is second.unit
+
+    def test_to_string_with_int_value(self):
+        ds = messages.DataSet(address="1.8.0", value=123)
+        assert ds.to_representation() == "1.8.0(123)"
+
+    def test_representation_is_reused(self):
+        ds = messages.DataSet(value="100", address="3.1.0", unit="kWh")
+        assert ds.to_representation() is ds.to_representation()
+
+    def test_representation_is_rebuilt_after_change(self):
+        ds = messages.DataSet(value="1", address="a")
+        assert ds.to_representation() == "a(1)"
+
+        ds.value = "2"
+
+        assert ds.to_representation() == "a(2)"
+
+    def test_bytes_are_reused(self):
+        ds = messages.DataSet(value="100", address="3.1.0", unit="kWh")
+        assert ds.to_bytes() is ds.to_bytes()
+
+    def test_bytes_are_rebuilt_after_change(self):
+        ds = messages.DataSet(value="1", address="a")
+        assert ds.to_bytes() == b"a(1)"
+
+        ds.value = "2"
+
+        assert ds.to_bytes() == b"a(2)"
+
     def test_to_byte_with_unit(self):
         ds = messages.DataSet(value="100", address="3.1.0", unit="kWh")
         assert ds.to_bytes() == self.data_set_with_unit.encode(constants.ENCODING)
@@ -55,6 +88,61 @@ class TestDataSets:
         with pytest.raises(exceptions.Iec6205621ParseError):
             ds = messages.DataSet.from_representation(self.not_valid_data)
 
+    def test_parse_bytes_with_unit(self):
+        ds = messages.DataSet.from_bytes(self.data_set_with_unit.encode("latin-1"))
+        assert ds.value == "100"
+        assert ds.address == "3.1.0"
+        assert ds.unit == "kWh"
+
+    def test_parse_bytes_without_unit(self):
+        ds = messages.DataSet.from_bytes(self.data_set_without_unit.encode("latin-1"))
+        assert ds.value == "100"
+        assert ds.address == "3.1.0"
+        assert ds.unit is None
+
+    def test_parse_invalid_bytes(self):
+        with pytest.raises(exceptions.Iec6205621ParseError):
+            messages.DataSet.from_bytes(self.not_valid_data.encode("latin-1"))
+
+    def test_from_string_just_value(self):
+        ds = messages.DataSet.from_representation("(1234567)")
+        assert ds.value == "1234567"
+        assert ds.address is None
+        assert ds.unit is None
+
+    def test_from_string_with_empty_value(self):
+        ds = messages.DataSet.from_representation("3.1.0()")
+        assert ds.value == ""
+        assert ds.address == "3.1.0"
+        assert ds.unit is None
+
+    @pytest.mark.parametrize(
+        "data_set_string, expected",
+        [
+            ("3.1.0(100*kWh)", ("3.1.0", "100", "kWh")),
+            ("3.1.0(100)", ("3.1.0", "100", None)),
+            ("3.1.0()", ("3.1.0", "", None)),
+            ("(100)", (None, "100", None)),
+            ("()", (None, "", None)),
+            ("1(2*3*kWh)", ("1", "2*3", "kWh")),
+            ("1(2(3)", ("1(2", "3", None)),
+            ("3.1.0(100*kWh)xyz", ("3.1.0", "100", "kWh")),
+            ("(100)(", (None, "100", None)),
+        ],
+    )
+    def test_parse_data_set(self, data_set_string, expected):
+        from_string = messages.DataSet.from_representation(data_set_string)
+        from_bytes = messages.DataSet.from_bytes(data_set_string.encode("latin-1"))
+        for ds in (from_string, from_bytes):
+            assert (ds.address, ds.value, ds.unit) == expected
+
+    @pytest.mark.parametrize("data_set_string", ["3.1.0)", "3.1.0", "100*kWh"])
+    def test_parse_invalid_data_set_raises_parse_error(self, data_set_string):
+        with pytest.raises(exceptions.Iec6205621ParseError):
+            messages.DataSet.from_representation(data_set_string)
+        with pytest.raises(exceptions.Iec6205621ParseError):
+            messages.DataSet.from_bytes(data_set_string.encode("latin-1"))
+
 
 class TestBase:
     def test_to_bytes(self):
@@ -77,6 +165,14 @@ class TestDataLine:
         assert dl.data_sets[0].address == "12"
         assert dl.data_sets[0].unit == "kWh"
 
+    def test_from_bytes(self):
+        dl = messages.DataLine.from_bytes(b"12(12*kWh)13(13*kWh)14(14*kwh)")
+
+        assert len(dl.data_sets) == 3
+        assert dl.data_sets[2].value == "14"
+        assert dl.data_sets[2].address == "14"
+        assert dl.data_sets[2].unit == "kwh"
+
     def test_to_representation(self):
         dl = messages.DataLine(
             data_sets=[
@@ -89,6 +185,15 @@ class TestDataLine:
 
         assert rep == "3:14(314*kWh)4:15(415*kWh)"
 
+    def test_to_representation_after_change(self):
+        dl = messages.DataLine(data_sets=[messages.DataSet(address="a", value="1")])
+        assert dl.to_representation() == "a(1)"
+
+        dl.data_sets.append(messages.DataSet(address="b", value="2"))
+        dl.data_sets[0].value = "3"
+
+        assert dl.to_representation() == "a(3)b(2)"
+
 
 class TestDataBlock:
     def test_from_representation_single_line(self):
@@ -108,6 +213,21 @@ class TestDataBlock:
 
         assert len(db.data_lines) == 3
 
+    def test_from_representation_without_trailing_line_end(self):
+        string_data = "12(12*kWh)\r\n13(13*kWh)"
+
+        db = messages.DataBlock.from_representation(string_data)
+
+        assert len(db.data_lines) == 2
+
+    def test_from_bytes_several_lines(self):
+        bytes_data = b"12(12*kWh)\r\n13(13*kWh)\r\n"
+
+        db = messages.DataBlock.from_bytes(bytes_data)
+
+        assert len(db.data_lines) == 2
+        assert db.data_lines[1].data_sets[0].address == "13"
+
     def test_to_representation_several_lines(self):
 
         db = messages.DataBlock(
@@ -165,6 +285,32 @@ class TestAnswerDataMessage:
         assert am.data[0].value == "0"
         assert am.data[0].address == "3:171.0"
 
+    def test_from_bytes(self):
+        data = b"\x023:171.0(0)\r\n3:172.0(1)\x03\x06"
+
+        am = messages.AnswerDataMessage.from_bytes(data)
+
+        assert len(am.data_block.data_lines) == 2
+        assert am.data[1].value == "1"
+        assert am.data[1].address == "3:172.0"
+
+    def test_from_bytes_invalid_bcc_raises_value_error(self):
+        data = b"\x023:171.0(0)\r\n3:172.0(1)\x03\x07"
+        with pytest.raises(ValueError):
+            messages.AnswerDataMessage.from_bytes(data)
+
+    def test_invalid_bcc_accepted_without_verify_bcc(self):
+        data = "\x023:171.0(0)\r\n\x03\x00"
+
+        from_string = messages.AnswerDataMessage.from_representation(
+            data, verify_bcc=False
+        )
+        from_bytes = messages.AnswerDataMessage.from_bytes(
+            data.encode("latin-1"), verify_bcc=False
+        )
+
+        assert from_string.data[0].value == from_bytes.data[0].value == "0"
+
     def test_from_representation_invalid_bcc_raises_value_error(self):
         data = "\x023:171.0(0)\x03\x11"
         with pytest.raises(ValueError):
@@ -213,12 +359,26 @@ class TestReadoutDataMessage:
         assert len(rdm.data_block.data_lines) == 1
         assert len(rdm.data_block.data_lines[0].data_sets) == 2
 
+    def test_from_bytes(self):
+
+        rdm = messages.ReadoutDataMessage.from_bytes(
+            b'\x023:14(314*kWh)4:15(415*kWh)\r\n!\r\n\x03"'
+        )
+        assert len(rdm.data_block.data_lines) == 1
+        assert rdm.data_block.data_lines[0].data_sets[1].unit == "kWh"
+
     def test_invalid_bcc_raises_error(self):
         with pytest.raises(ValueError):
             rdm = messages.ReadoutDataMessage.from_representation(
                 "\x023:14(314*kWh)4:15(415*kWh)\r\n!\r\n\x03x"
             )
 
+    def test_invalid_bcc_accepted_without_verify_bcc(self):
+        rdm = messages.ReadoutDataMessage.from_bytes(
+            b"\x023:14(314*kWh)4:15(415*kWh)\r\n!\r\n\x03x", verify_bcc=False
+        )
+        assert rdm.data_block.data_lines[0].data_sets[0].value == "314"
+
 
 class TestCommandMessage:
     def test_command_message_to_representation(self):
@@ -265,6 +425,37 @@ class TestCommandMessage:
 
         assert break_msg.to_representation() == "\x01B0\x03q"
 
+    def test_from_representation_without_data_set(self):
+        cm = messages.CommandMessage.from_representation("\x01B0\x03q")
+
+        assert cm.command == "B"
+        assert cm.command_type == "0"
+        assert cm.data_set is None
+
+    def test_from_bytes(self):
+        cm = messages.CommandMessage.from_bytes(b"\x01P0\x02(1234567)\x03P")
+
+        assert cm.command == "P"
+        assert cm.command_type == "0"
+        assert cm.data_set.value == "1234567"
+        assert cm.data_set.address is None
+
+    def test_from_bytes_without_data_set(self):
+        cm = messages.CommandMessage.from_bytes(b"\x01B0\x03q")
+
+        assert cm.command == "B"
+        assert cm.data_set is None
+
+    def test_from_representation_without_verify_bcc(self):
+        cm = messages.CommandMessage.from_representation(
+            "\x01P0\x02(1234567)\x03X", verify_bcc=False
+        )
+        assert cm.data_set.value == "1234567"
+
+    def test_from_bytes_invalid_bcc_raise_value_error(self):
+        with pytest.raises(ValueError):
+            messages.CommandMessage.from_bytes(b"\x01P0\x02(1234567)\x03X")
+
     def test_from_representation_invalid_bcc_raise_value_error(self):
         data = "\x01P0\x02(1234567)\x03X"
         with pytest.raises(ValueError):
@@ -294,6 +485,11 @@ class TestCommandMessage:
         assert cm.data_set.address == "1.8.0"
         assert cm.data_set.value == "123"
 
+    def test_for_single_write_with_int_value(self):
+        cm = messages.CommandMessage.for_single_write("1.8.0", 123)
+
+        assert cm.to_bytes() == b"\x01W1\x021.8.0(123)\x03o"
+
 
 class TestRequestMessage:
     def test_to_representation(self):
@@ -0,0 +1,167 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from iec62056_21 import exceptions, lis200, messages
+
+
+def answer_with_values(*values):
+    return answer_with_lines(values)
+
+
+def answer_with_lines(*lines):
+    data_lines = [
+        messages.DataLine(data_sets=[messages.DataSet(value=value) for value in line])
+        for line in lines
+    ]
+    data_block = messages.DataBlock(data_lines=data_lines)
+    return messages.AnswerDataMessage(data_block=data_block)
+
+
+class TestLis200ErrorParser:
+    def test_no_error_passes(self):
+        parser = lis200.Lis200ErrorParser()
+        parser.check_for_errors(answer_with_values("123.4", "2019-06-12,10:00:00"))
+
+    def test_error_code_raises_mapped_exception(self):
+        parser = lis200.Lis200ErrorParser()
+        with pytest.raises(lis200.WrongAccessCodeError):
+            parser.check_for_errors(answer_with_values("123.4", "#0017"))
+
+    def test_first_error_is_raised(self):
+        parser = lis200.Lis200ErrorParser()
+        with pytest.raises(lis200.ArchiveEmptyError):
+            parser.check_for_errors(answer_with_values("#0103", "#0017"))
+
+    def test_error_code_must_be_at_start_of_value(self):
+        parser = lis200.Lis200ErrorParser()
+        parser.check_for_errors(answer_with_values("12#0017"))
+
+    def test_empty_values_are_ignored(self):
+        parser = lis200.Lis200ErrorParser()
+        parser.check_for_errors(answer_with_values("", None))
+
+
+class TestArchiveReadout:
+    def make_readout(self, utc_offset=None):
+        return lis200.ArchiveReadout(
+            values=answer_with_lines(
+                ("1", "2019-06-12,10:00:00", "123.4"),
+                ("2", "2019-06-12,11:00:00", "125.0"),
+            ),
+            addresses=answer_with_lines(("01:0000", "01:0400", "02:0300")),
+            units=answer_with_lines(("", "", "m3")),
+            datetime_position=2,
+            utc_offset=utc_offset,
+        )
+
+    def test_data(self):
+        data = self.make_readout().data
+
+        assert len(data) == 6
+        assert data[2] == lis200.ArchiveDataPoint(
+            timestamp=datetime(2019, 6, 12, 10, 0, 0),
+            value="123.4",
+            address="2:0300",
+            unit="m3",
+        )
+        assert data[3].timestamp == datetime(2019, 6, 12, 11, 0, 0)
+        assert data[3].unit is None
+
+    def test_data_with_utc_offset(self):
+        data = self.make_readout(utc_offset=3600).data
+
+        assert data[0].timestamp == datetime(
+            2019, 6, 12, 10, 0, 0, tzinfo=timezone(timedelta(hours=1))
+        )
+
+    def test_iter_data_is_lazy(self):
+        data = self.make_readout().iter_data()
+
+        assert next(data).value == "1"
+
+    def make_readout_with_extra_value(self, datetime_position=2):
+        values = ["1", "123.4", "9"]
+        values.insert(datetime_position - 1, "2019-06-12,10:00:00")
+        return lis200.ArchiveReadout(
+            values=answer_with_lines(values),
+            addresses=answer_with_lines(("01:0000", "01:0400", "02:0300")),
+            units=answer_with_lines(("", "", "m3")),
+            datetime_position=datetime_position,
+            utc_offset=None,
+        )
+
+    def test_more_values_than_addresses_raises_parse_error(self):
+        readout = self.make_readout_with_extra_value()
+
+        with pytest.raises(exceptions.Iec6205621ParseError):
+            readout.data
+
+    @pytest.mark.parametrize("datetime_position", [2, 4])
+    def test_columnar_more_values_than_addresses_raises_parse_error(
+        self, datetime_position
+    ):
+        readout = self.make_readout_with_extra_value(datetime_position)
+
+        with pytest.raises(exceptions.Iec6205621ParseError):
+            readout.columnar()
+
+    def test_columnar_with_short_line_matches_data(self):
+        readout = lis200.ArchiveReadout(
+            values=answer_with_lines(("1", "2019-06-12,10:00:00")),
+            addresses=answer_with_lines(("01:0000", "01:0400", "02:0300")),
+            units=answer_with_lines(("", "", "m3")),
+            datetime_position=2,
+            utc_offset=None,
+        )
+        columns = readout.columnar()
+
+        assert columns["values"] == [point.value for point in readout.data]
+        assert columns["addresses"] == ["1:0000", "1:0400"]
+
+    def test_columnar_matches_data(self):
+        readout = self.make_readout()
+        columns = readout.columnar()
+
+        assert [
+            lis200.ArchiveDataPoint(*point)
+            for point in zip(
+                columns["timestamps"],
+                columns["values"],
+                columns["addresses"],
+                columns["units"],
+            )
+        ] == readout.data
+
+
+class TestDatetime:
+    def test_parse_datetime(self):
+        assert lis200.parse_datetime("2019-06-12,08:05:09") == datetime(
+            2019, 6, 12, 8, 5, 9
+        )
+
+    def test_parse_datetime_with_utc_offset(self):
+        dt = lis200.parse_datetime("2019-06-12,08:05:09", utc_offset=7200)
+        assert dt.utcoffset() == timedelta(hours=2)
+
+    @pytest.mark.parametrize(
+        "datetime_string",
+        [
+            "2019-06-12 08:05:09",
+            "2019-06-12,08x05x09",
+            "2019-06-12, 8:05:09",
+            "2019-06-12,08:05:+9",
+        ],
+    )
+    def test_parse_invalid_datetime_raises_value_error(self, datetime_string):
+        with pytest.raises(ValueError):
+            lis200.parse_datetime(datetime_string)
+
+    def test_format_datetime(self):
+        dt = datetime(2019, 6, 2, 8, 5, 9)
+        assert lis200.format_datetime(dt) == "2019-06-02,08:05:09"
+
+    def test_format_aware_datetime_raises_value_error(self):
+        dt = datetime(2019, 6, 2, 8, 5, 9, tzinfo=timezone.utc)
+        with pytest.raises(ValueError):
+            lis200.format_datetime(dt)
@@ -0,0 +1,190 @@
+import pytest
+import socket
+
+from iec62056_21 import transports, utils
+
+
+class ChunkedTransport(transports.BaseTransport):
+    """
+    Hands out the incoming data in the given chunks and records every receive.
+    """
+
+    def __init__(self, chunks):
+        super().__init__(timeout=1)
+        self.chunks = list(chunks)
+        self.receives = 0
+        self.sent = list()
+
+    def _send(self, data):
+        self.sent.append(data)
+
+    def _recv_chunk(self):
+        self.receives += 1
+        if not self.chunks:
+            return b""
+        return self.chunks.pop(0)
+
+
+class ExactTransport(transports.BaseTransport):
+    """
+    Implements only _recv, blocking until all chars are received like a serial
+    port without a timeout would.
+    """
+
+    def __init__(self, incoming):
+        super().__init__(timeout=1)
+        self.incoming = incoming
+        self.requested = list()
+
+    def _recv(self, chars=1):
+        self.requested.append(chars)
+        if len(self.incoming) < chars:
+            raise AssertionError("Would block")
+        data = self.incoming[:chars]
+        self.incoming = self.incoming[chars:]
+        return data
+
+
+class TestRecv:
+    def test_subclass_with_only_recv_is_asked_for_one_byte(self):
+        message = utils.add_bcc(b"\x021.8.0(1*kWh)\r\n!\r\n\x03")
+        trans = ExactTransport(message)
+
+        assert trans.read() == message
+        assert set(trans.requested) == {1}
+
+    def test_recv_waits_for_all_chars(self):
+        trans = ChunkedTransport([b"a", b"bc"])
+
+        assert trans.recv(3) == b"abc"
+
+    def test_recv_returns_what_is_received_before_transport_stops(self):
+        trans = ChunkedTransport([b"ab"])
+
+        assert trans.recv(3) == b"ab"
+
+    def test_recv_is_served_from_one_chunk(self):
+        trans = ChunkedTransport([b"abc"])
+
+        assert [trans.recv(1) for _ in range(3)] == [b"a", b"b", b"c"]
+        assert trans.receives == 1
+
+
+class TestRead:
+    def test_read_message_split_over_chunks(self):
+        message = utils.add_bcc(b"\x021.8.0(1*kWh)\r\n!\r\n\x03")
+        trans = ChunkedTransport([b"junk" + message[:5], message[5:]])
+
+        assert trans.read() == message
+        assert trans.receives == 2
+
+    def test_read_partial_blocks(self):
+        first = utils.add_bcc(b"\x021.8.0(1*kWh)\x04")
+        last = utils.add_bcc(b"\x022.8.0(2*kWh)\r\n\x03")
+        trans = ChunkedTransport([first + last])
+
+        data = trans.read()
+
+        assert data == utils.add_bcc(b"\x021.8.0(1*kWh)\r\n2.8.0(2*kWh)\r\n\x03")
+        assert type(data) is bytes
+        assert trans.sent == [b"\x06"]
+
+    def test_read_nacks_invalid_bcc_and_reads_again(self):
+        message = utils.add_bcc(b"\x021.8.0(1*kWh)\r\n!\r\n\x03")
+        invalid = message[:-1] + b"\x00"
+        trans = ChunkedTransport([invalid, message])
+
+        assert trans.read() == message
+        assert trans.sent == [b"\x15"]
+
+    def test_read_times_out_without_end_char(self):
+        trans = ChunkedTransport([b"\x02no end"])
+        trans.timeout = 0
+
+        with pytest.raises(TimeoutError):
+            trans.read()
+
+    def test_read_uses_given_timeout(self):
+        trans = ChunkedTransport([b"\x02no end"])
+        trans.timeout = 1000
+
+        with pytest.raises(TimeoutError):
+            trans.read(timeout=0.01)
+
+    def test_simple_read(self):
+        trans = ChunkedTransport([b"xx/ABC5\\2ident\r\nrest"])
+
+        assert trans.simple_read("/", "\x0a") == b"/ABC5\\2ident\r\n"
+
+
+class TestTcpTransport:
+    def test_read_over_socket(self):
+        message = utils.add_bcc(b"\x021.8.0(1*kWh)\r\n!\r\n\x03")
+        local, remote = socket.socketpair()
+        trans = transports.TcpTransport(address=("127.0.0.1", 5000))
+        trans.socket.close()
+        trans.socket = local
+        remote.sendall(message)
+
+        try:
+            assert trans.read() == message
+        finally:
+            local.close()
+            remote.close()
+
+    def test_socket_disables_nagle(self):
+        trans = transports.TcpTransport(address=("127.0.0.1", 5000))
+
+        assert trans.socket.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+        trans.socket.close()
+
+
+class FakeSerial:
+    def __init__(self, port, **kwargs):
+        self.incoming = b""
+        self.read_sizes = list()
+        self.low_latency = False
+
+    @property
+    def in_waiting(self):
+        return len(self.incoming)
+
+    def read(self, size=1):
+        self.read_sizes.append(size)
+        data = self.incoming[:size]
+        self.incoming = self.incoming[size:]
+        return data
+
+    def set_low_latency_mode(self, low_latency):
+        self.low_latency = low_latency
+
+
+class TestSerialTransport:
+    def test_reads_what_is_waiting(self, monkeypatch):
+        monkeypatch.setattr(transports.serial, "Serial", FakeSerial)
+        trans = transports.SerialTransport(port="/dev/ttyUSB0")
+        trans.connect()
+        trans.port.incoming = b"/ABC5\\2ident\r\n"
+
+        assert trans.simple_read("/", "\x0a") == b"/ABC5\\2ident\r\n"
+        assert trans.port.read_sizes == [14]
+
+    def test_low_latency_mode(self, monkeypatch):
+        monkeypatch.setattr(transports.serial, "Serial", FakeSerial)
+        trans = transports.SerialTransport(port="/dev/ttyUSB0", low_latency=True)
+        trans.connect()
+
+        assert trans.port.low_latency
+
+        trans.switch_baudrate(9600)
+
+        assert trans.port.low_latency
+
+    def test_low_latency_mode_not_supported(self, monkeypatch):
+        monkeypatch.setattr(transports.serial, "Serial", FakeSerial)
+        monkeypatch.delattr(FakeSerial, "set_low_latency_mode")
+        trans = transports.SerialTransport(port="/dev/ttyUSB0", low_latency=True)
+
+        trans.connect()
+
+        assert trans.port is not None